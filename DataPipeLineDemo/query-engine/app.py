@@ -1,10 +1,34 @@
 import os
+import re
+import asyncio
+import decimal
+import orjson
+import threading
 import duckdb
+from collections import OrderedDict
+from deltalake import DeltaTable
 from fastapi import FastAPI, HTTPException
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 import time
 
-app = FastAPI()
+def json_default(value):
+    """orjson fallback for DECIMAL/HUGEINT results (e.g. SUM over INTEGER), which Arrow hands over as Decimal"""
+    if isinstance(value, decimal.Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    raise TypeError
+
+
+class QueryResponse(ORJSONResponse):
+    """ORJSONResponse that also serializes Decimal values"""
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, default=json_default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+
+app = FastAPI(default_response_class=QueryResponse)
+# Large result sets compress well, small ones are sent as is
+app.add_middleware(GZipMiddleware, minimum_size=1024)
 
 # Env vars
 MINIO_ENDPOINT = os.getenv('MINIO_ENDPOINT')
@@ -12,14 +36,32 @@ MINIO_BUCKET = os.getenv('MINIO_BUCKET')
 MINIO_ACCESS_KEY = os.getenv('MINIO_ACCESS_KEY')
 MINIO_SECRET_KEY = os.getenv('MINIO_SECRET_KEY')
 DELTA_PATH = os.getenv('DELTA_PATH')
+RESULT_CACHE_BYTES = int(os.getenv('RESULT_CACHE_BYTES', 256 * 1024 * 1024))  # Default 256 MiB
+
+# Storage options for reading the Delta Lake log from MinIO (non-SSL local)
+storage_options = {
+    'AWS_ENDPOINT': f'http://{MINIO_ENDPOINT}',
+    'AWS_ACCESS_KEY_ID': MINIO_ACCESS_KEY,
+    'AWS_SECRET_ACCESS_KEY': MINIO_SECRET_KEY,
+    'AWS_REGION': 'us-east-1',
+    'AWS_ALLOW_HTTP': 'true'
+}
 
 # Disable AWS metadata fetch explicitly
 os.environ['AWS_EC2_METADATA_DISABLED'] = 'true'
 
 # DuckDB connection setup (on startup)
 con = duckdb.connect(database=':memory:', read_only=False)
+con.execute(f"PRAGMA threads={os.cpu_count()};")
 con.execute("INSTALL delta;")
 con.execute("LOAD delta;")
+con.execute("INSTALL httpfs;")
+con.execute("LOAD httpfs;")
+# Keep S3 connections, object metadata and Parquet footers across queries.
+# Delta data files are immutable, so none of these can go stale; new commits just add new files
+# GLOBAL, since every query runs on its own cursor and a plain SET would only cover this one
+for setting in ('http_keep_alive', 'enable_http_metadata_cache', 'parquet_metadata_cache'):
+    con.execute(f"SET GLOBAL {setting}=true;")
 con.execute(f"""
     CREATE SECRET delta_s1 (
         TYPE s3,
@@ -35,7 +77,7 @@ con.execute(f"""
 
 # For initial validation/testing
 curr_query = f"SELECT device_id, timestamp, temperature, humidity FROM delta_scan('{DELTA_PATH}');"
-curr_result = con.execute(curr_query).fetchdf().to_dict(orient='records')
+curr_result = con.execute(curr_query).fetchall()
 print(f"Found {len(curr_result)} records")
 
 con.execute(f"""
@@ -49,11 +91,104 @@ print(f"Created view telemetry_view based on {DELTA_PATH}")
 class Query(BaseModel):
     sql: str
 
+# One table handle, refreshed incrementally: only log entries newer than the loaded version are read
+delta_table = DeltaTable(DELTA_PATH, storage_options=storage_options)
+delta_lock = threading.Lock()
+
+def delta_version() -> int:
+    """Current version of the Delta Lake table, bumped by every export"""
+    with delta_lock:
+        delta_table.update_incremental()
+        return delta_table.version()
+
+# Results of read-only queries against the view, for the current Delta version only, bounded in bytes
+result_cache = OrderedDict()
+result_cache_state = {'version': None, 'bytes': 0}
+result_cache_lock = threading.Lock()
+
+# Functions whose result changes between calls, queries using them are never cached
+VOLATILE_SQL = re.compile(
+    r"\b(now|random|uuid|gen_random_uuid|setseed|nextval|currval|today|get_current_time"
+    r"|current_timestamp|current_date|current_time|current_localtimestamp|current_localtime)\b",
+    re.IGNORECASE
+)
+
+# The only relation whose changes the Delta version tracks, as it may be written in a query
+CACHEABLE_TABLES = {'telemetry_view', 'main.telemetry_view'}
+
+def table_refs(node, refs: list) -> list:
+    """Collect what a serialized parse tree reads from, table functions (read_csv, ...) show up as None"""
+    if isinstance(node, dict):
+        if node.get('type') == 'BASE_TABLE':
+            refs.append('.'.join(p for p in (node['catalog_name'], node['schema_name'], node['table_name']) if p).lower())
+        elif node.get('type') == 'TABLE_FUNCTION':
+            refs.append(None)
+        for value in node.values():
+            table_refs(value, refs)
+    elif isinstance(node, list):
+        for value in node:
+            table_refs(value, refs)
+    return refs
+
+def is_cacheable(sql: str) -> bool:
+    """Only a single deterministic SELECT reading nothing but telemetry_view is safe to serve from the cache"""
+    cursor = con.cursor()
+    try:
+        statements = cursor.extract_statements(sql)
+        if (len(statements) != 1
+                or statements[0].type != duckdb.StatementType.SELECT
+                or VOLATILE_SQL.search(sql)):
+            return False
+        # Parsed, not bound: get_table_names would expand the view, which it reports as nothing, and hit S3
+        tree = orjson.loads(cursor.execute("SELECT json_serialize_sql(?)", [sql]).fetchone()[0])
+    except duckdb.Error:
+        return False
+    if tree['error']:
+        return False
+    # Anything else read could change without a new Delta version. CTE names count as tables too,
+    # which keeps a CTE shadowing telemetry_view out of the cache
+    refs = table_refs(tree['statements'], [])
+    return bool(refs) and set(refs) <= CACHEABLE_TABLES
+
+def run_sql(sql: str):
+    # A cursor per call, since the shared connection must not be used from several threads at once
+    return con.cursor().execute(sql).fetch_arrow_table()
+
+def cached_query(sql: str, version: int):
+    """Run the SQL once per Delta table version, repeats are served from memory"""
+    with result_cache_lock:
+        if result_cache_state['version'] != version:
+            # A new export makes every cached result stale
+            result_cache.clear()
+            result_cache_state.update(version=version, bytes=0)
+        if sql in result_cache:
+            result_cache.move_to_end(sql)
+            return result_cache[sql]
+    table = run_sql(sql)
+    if table.nbytes > RESULT_CACHE_BYTES:
+        return table
+    with result_cache_lock:
+        if result_cache_state['version'] == version and sql not in result_cache:
+            result_cache[sql] = table
+            result_cache_state['bytes'] += table.nbytes
+            # Evict least recently used results until back under the byte budget
+            while result_cache_state['bytes'] > RESULT_CACHE_BYTES:
+                _, evicted = result_cache.popitem(last=False)
+                result_cache_state['bytes'] -= evicted.nbytes
+    return table
+
+def execute(sql: str) -> list:
+    """Blocking part of a query, meant to run off the event loop"""
+    if not is_cacheable(sql):
+        return run_sql(sql).to_pylist()
+    return cached_query(sql, delta_version()).to_pylist()
+
 @app.post("/query")
-def run_query(query: Query):
+async def run_query(query: Query):
     try:
         # Execute user SQL (e.g., against the view for stability)
-        result = con.execute(query.sql).fetchdf().to_dict(orient='records')
-        return {"result": result}
+        result = await asyncio.to_thread(execute, query.sql.strip())
+        # Returned as a response directly, so orjson serializes the rows without a jsonable_encoder pass
+        return QueryResponse({"result": result})
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
\ No newline at end of file
@@ -1,10 +1,15 @@
+import io
 import os
 import time
 import random
+import uuid
 from datetime import datetime
+import numpy as np
 import pandas as pd
-from faker import Faker
+import pyarrow.compute as pc
+import connectorx as cx
 from sqlalchemy import create_engine, text
+from deltalake import CommitProperties, DeltaTable
 from deltalake.writer import write_deltalake
 from apscheduler.schedulers.background import BackgroundScheduler
 import s3fs
@@ -18,6 +23,7 @@ MINIO_BUCKET = os.getenv('MINIO_BUCKET')
 DELTA_PATH = os.getenv('DELTA_PATH')
 NUM_RECORDS = int(os.getenv('NUM_RECORDS', 1000))
 EXPORT_INTERVAL = int(os.getenv('EXPORT_INTERVAL', 300))  # Default 5 min
+COMPACT_INTERVAL = int(os.getenv('COMPACT_INTERVAL', 3600))  # Default 1 hour
 
 # Storage options for MinIO (non-SSL local)
 storage_options = {
@@ -28,6 +34,9 @@ storage_options = {
     'AWS_S3_ALLOW_UNSAFE_RENAME': 'true'
 }
 
+# Shared engine, so the connection pool survives across scheduled runs
+engine = create_engine(POSTGRES_URL, pool_pre_ping=True, pool_size=4, max_overflow=0)
+
 # Create MinIO bucket if not exists
 fs = s3fs.S3FileSystem(
     endpoint_url=f'http://{MINIO_ENDPOINT}',
@@ -37,40 +46,84 @@ fs = s3fs.S3FileSystem(
 if not fs.exists(MINIO_BUCKET):
     fs.mkdir(MINIO_BUCKET)
 
+# Delta commit metadata key holding the highest telemetry id exported so far
+BOOKMARK_KEY = 'telemetry_last_id'
+
+# Create the source table once on start, so the periodic jobs never take schema locks
+def setup_schema():
+    with engine.connect() as conn:
+        # Monotonic row id, used by the export as its bookmark (timestamps are random, so unusable)
+        conn.execute(text("CREATE TABLE IF NOT EXISTS telemetry (device_id VARCHAR, timestamp TIMESTAMP, temperature INT, humidity INT, id BIGSERIAL)"))
+        # Tables created before the id column existed
+        conn.execute(text("ALTER TABLE telemetry ADD COLUMN IF NOT EXISTS id BIGSERIAL"))
+        conn.commit()
+
 # Seed mock telemetry data
 def seed_data(randomize=False):
     sample_size = NUM_RECORDS
     if randomize:
         sample_size = random.randint(1, NUM_RECORDS)
-    engine = create_engine(POSTGRES_URL)
-    fake = Faker()
-    data = []
-    for _ in range(sample_size):
-        data.append({
-            'device_id': fake.uuid4(),
-            'timestamp': fake.date_time_this_year(),
-            'temperature': fake.random_number(digits=2),
-            'humidity': fake.random_number(digits=2)
-        })
-    df = pd.DataFrame(data)
-    with engine.connect() as conn:
-        conn.execute(text("CREATE TABLE IF NOT EXISTS telemetry (device_id VARCHAR, timestamp TIMESTAMP, temperature INT, humidity INT)"))
-        df.to_sql('telemetry', conn, if_exists='append', index=False)
-        conn.commit()
+    # Generate the whole sample in one go, timestamps fall between start of the year and now
+    now = datetime.now()
+    start_ts = int(datetime(now.year, 1, 1).timestamp())
+    end_ts = int(now.timestamp())
+    df = pd.DataFrame({
+        'device_id': [str(uuid.uuid4()) for _ in range(sample_size)],
+        'timestamp': pd.to_datetime(np.random.randint(start_ts, end_ts + 1, sample_size), unit='s'),
+        'temperature': np.random.randint(0, 100, sample_size),
+        'humidity': np.random.randint(0, 100, sample_size)
+    })
+    # begin() rather than connect(), the COPY bypasses conn.execute so nothing else would open the transaction
+    with engine.begin() as conn:
+        # Bulk load through COPY rather than row-wise INSERTs
+        buffer = io.StringIO()
+        df.to_csv(buffer, index=False, header=False)
+        buffer.seek(0)
+        with conn.connection.cursor() as cursor:
+            cursor.copy_expert("COPY telemetry (device_id, timestamp, temperature, humidity) FROM STDIN WITH CSV", buffer)
     with open('/tmp/table_seeding_done', 'a') as f:
         f.write(f"Seeded: {datetime.now().strftime('%H:%M:%S.%f')}, Record(s): {sample_size}\n")
     print(f"Seeded {sample_size} records.")
 
+# Last exported id, as recorded by the most recent export commit (compactions carry no bookmark)
+def last_exported_id():
+    if not DeltaTable.is_deltatable(DELTA_PATH, storage_options=storage_options):
+        return None
+    for commit in DeltaTable(DELTA_PATH, storage_options=storage_options).history(limit=100):
+        if BOOKMARK_KEY in commit:
+            return int(commit[BOOKMARK_KEY])
+    return None
+
 # Export to Delta Lake in MinIO
 def export_data():
-    engine = create_engine(POSTGRES_URL)
-    df = pd.read_sql('SELECT * FROM telemetry', engine)
-    write_deltalake(DELTA_PATH, df, mode='overwrite', schema_mode='merge', storage_options=storage_options)
+    last_id = last_exported_id()
+    # Only ship the rows added since the previous export; with no bookmark yet, (re)write the table in full
+    # Read straight into Arrow, which write_deltalake consumes natively
+    table = cx.read_sql(
+        POSTGRES_URL,
+        f"SELECT * FROM telemetry WHERE id > {int(last_id or 0)} ORDER BY id",
+        return_type='arrow'
+    )
+    if table.num_rows:
+        mode = 'append' if last_id is not None else 'overwrite'
+        # The bookmark is part of the same Delta commit as the rows, so a failed export leaves neither behind
+        # and the next run retries the batch without duplicating it
+        bookmark = CommitProperties(custom_metadata={BOOKMARK_KEY: str(pc.max(table['id']).as_py())})
+        write_deltalake(DELTA_PATH, table, mode=mode, schema_mode='merge', storage_options=storage_options,
+                        commit_properties=bookmark)
     with open('/tmp/export_data_done', 'a') as f:
-        f.write(f"Exported: {datetime.now().strftime('%H:%M:%S.%f')}, Record(s): {len(df)}\n")
-    print("Exported data to Delta Lake.")
+        f.write(f"Exported: {datetime.now().strftime('%H:%M:%S.%f')}, Record(s): {table.num_rows}\n")
+    print(f"Exported {table.num_rows} new records to Delta Lake.")
+
+# Compact the small files left behind by incremental appends
+def compact_data():
+    if not DeltaTable.is_deltatable(DELTA_PATH, storage_options=storage_options):
+        return
+    metrics = DeltaTable(DELTA_PATH, storage_options=storage_options).optimize.compact()
+    print(f"Compacted Delta Lake table: {metrics.get('numFilesRemoved', 0)} file(s) into {metrics.get('numFilesAdded', 0)}.")
 
 if __name__ == '__main__':
+    setup_schema()
     # Seed once on start
     seed_data()
     
@@ -79,6 +132,8 @@ if __name__ == '__main__':
     scheduler.add_job(seed_data, 'interval', seconds=30, args=[True])
     # Schedule periodic export
     scheduler.add_job(export_data, 'interval', seconds=EXPORT_INTERVAL)
+    # Schedule periodic compaction
+    scheduler.add_job(compact_data, 'interval', seconds=COMPACT_INTERVAL)
     scheduler.start()
     
     # Keep running
@@ -1,28 +1,102 @@
+import abc
 import asyncio
+import ctypes
+import ctypes.util
+import errno
+import logging
+import multiprocessing
 import socket
 import struct
+import sys
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 import time
 from typing import Dict, Any, Tuple
-from functools import wraps
+from functools import lru_cache, wraps
 import os
 
+# Per-packet output goes through this logger at DEBUG level, so it costs nothing unless LOG_LEVEL=DEBUG
+logger = logging.getLogger('netflow_receiver')
+
+# Timing every packet is a demo aid, off unless TIMEIT=true
+TIMEIT_ENABLED = (os.getenv('TIMEIT', 'false').lower() == 'true')
+# A summary line is logged once every this many packets, 0 turns it off
+LOG_EVERY_N = max(0, int(os.getenv('LOG_EVERY_N', '1000')))
+# A large receive buffer absorbs bursts while the loop is busy, instead of the kernel dropping them
+SOCKET_RCVBUF = int(os.getenv('SOCKET_RCVBUF', str(64 * 1024 * 1024)))
+# More than one process shares the port through SO_REUSEPORT, the kernel spreads flows across them
+RECEIVER_PROCESSES = int(os.getenv('RECEIVER_PROCESSES', '1'))
+
 
 def async_timeit(func):
     """
     A decorator to measure the execution time of an asynchronous function.
+    A no-op unless TIMEIT is enabled.
     """
+    if not TIMEIT_ENABLED:
+        return func
+
     @wraps(func)
     async def wrapper(*args, **kwargs):
         start_time = time.perf_counter()
         result = await func(*args, **kwargs)  # Await the coroutine
         end_time = time.perf_counter()
         total_time = end_time - start_time
-        print(f"    Function: '{func.__name__}', time(seconds): {total_time:.8f}")
+        logger.info("    Function: '%s', time(seconds): %.8f", func.__name__, total_time)
         return result
     return wrapper
 
 
+# Netflow v5 wire formats, compiled once instead of on every unpack
+NETFLOW_HEADER = struct.Struct('!HHIIIIBBH')  # 24 bytes
+NETFLOW_FLOW = struct.Struct('!IIIHHIIIIHHBBBBHHBBH')  # 48 bytes
+
+
+# Protocol names indexed by protocol number, the protocol field is a single byte
+PROTOCOL_NAMES = [f'Unknown({i})' for i in range(256)]
+for _num, _name in ((1, 'ICMP'), (6, 'TCP'), (17, 'UDP'), (47, 'GRE'), (50, 'ESP'), (51, 'AH'), (89, 'OSPF')):
+    PROTOCOL_NAMES[_num] = _name
+
+
+@lru_cache(maxsize=4096)
+def ipv4_to_str(value: int) -> str:
+    """Dotted-quad form of an IPv4 address held as a host-order integer, cached since flows reuse addresses"""
+    return f"{value >> 24 & 255}.{value >> 16 & 255}.{value >> 8 & 255}.{value & 255}"
+
+
+# NumPy lets all flows of a packet be decoded in one go, fall back to per-flow struct unpacking otherwise
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+    # Same 48-byte big-endian layout as NETFLOW_FLOW
+    NETFLOW_FLOW_DTYPE = np.dtype([
+        ('srcaddr', '>u4'), ('dstaddr', '>u4'), ('nexthop', '>u4'),
+        ('input_snmp', '>u2'), ('output_snmp', '>u2'),
+        ('packets', '>u4'), ('bytes', '>u4'), ('first', '>u4'), ('last', '>u4'),
+        ('srcport', '>u2'), ('dstport', '>u2'),
+        ('pad1', 'u1'), ('tcp_flags', 'u1'), ('protocol', 'u1'), ('tos', 'u1'),
+        ('src_as', '>u2'), ('dst_as', '>u2'),
+        ('src_mask', 'u1'), ('dst_mask', 'u1'), ('pad2', '>u2'),
+    ])
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+IPV4_FIELDS = ('srcaddr', 'dstaddr', 'nexthop')
+
+
+def flow_dicts(flows) -> list:
+    """Per-flow dicts for display, from either a list of dicts or a NumPy record array"""
+    if not NUMPY_AVAILABLE or not isinstance(flows, np.ndarray):
+        return flows
+    records = [dict(zip(flows.dtype.names, row)) for row in flows.tolist()]
+    for record in records:
+        for field in IPV4_FIELDS:
+            record[field] = ipv4_to_str(record[field])
+    return records
+
+
 # By default, expect the Rust module to be available, but fall back to Python oterhwise
 RUST_AVAILABLE = (os.getenv('RUST_AVAILABLE', 'True').lower() == 'true')
 if RUST_AVAILABLE:
@@ -35,11 +109,33 @@ if RUST_AVAILABLE:
         RUST_AVAILABLE = False
 print(f"Rust module is disabled (via settings), using Python fallback")
 
+
+def open_udp_socket(host: str, port: int) -> socket.socket:
+    """Bind the UDP socket shared by every receive backend, with an enlarged receive buffer"""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    if RECEIVER_PROCESSES > 1:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    try:
+        # SO_RCVBUFFORCE goes past net.core.rmem_max, but needs CAP_NET_ADMIN
+        sock.setsockopt(socket.SOL_SOCKET, getattr(socket, 'SO_RCVBUFFORCE', socket.SO_RCVBUF), SOCKET_RCVBUF)
+    except OSError:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_RCVBUF)
+    print(f"Socket receive buffer: {sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF)} bytes")
+    sock.bind((host, port))
+    return sock
+
 class NetflowReceiver:
-    def __init__(self, host: str = '0.0.0.0', port: int = 2055):
+    def __init__(self, host: str = '0.0.0.0', port: int = 2055, worker_count: int = 4, queue_size: int = 10000,
+                 recv_backend: str = 'auto', process_workers: int = 0):
         self.host = host
         self.port = port
+        self.recv_backend = recv_backend
+        self.process_workers = process_workers
+        self.pool = None
+        self.worker_count = worker_count
+        self.queue_size = queue_size
         self.transport = None
+        self.protocol = None
         self.packet_count = 0
         self.rust_processing_enabled = RUST_AVAILABLE
         self.rust_success_count = 0
@@ -50,17 +146,46 @@ class NetflowReceiver:
         print(f"Starting netflow receiver on {self.host}:{self.port}")
         
         loop = asyncio.get_event_loop()
-        self.transport, protocol = await loop.create_datagram_endpoint(
-            lambda: NetflowProtocol(self.handle_packet),
-            local_addr=(self.host, self.port)
-        )
+        if self.process_workers > 0:
+            # Parsing is CPU-bound, so it runs in worker processes to get past the GIL.
+            # Spawned rather than forked, as the reader may already have a thread running
+            self.pool = ProcessPoolExecutor(max_workers=self.process_workers,
+                                            mp_context=multiprocessing.get_context('spawn'))
+            print(f"Parsing in {self.process_workers} worker process(es)")
+        self.protocol = NetflowProtocol(self.handle_packet, self.worker_count, self.queue_size)
+        self.transport = self.start_reader(loop)
+        if self.transport is None:
+            self.transport, _ = await loop.create_datagram_endpoint(
+                lambda: self.protocol,
+                sock=open_udp_socket(self.host, self.port)
+            )
+            print("Receive backend: asyncio")
         print(f"Receiver listening on {self.host}:{self.port}")
+
+    def start_reader(self, loop):
+        """Start the fastest Linux batch reader allowed by RECV_BACKEND, or return None for the asyncio path"""
+        for reader_class in (IoUringReader, RecvmmsgReader, RecvIntoReader):
+            wanted = reader_class.name == self.recv_backend or (self.recv_backend == 'auto' and reader_class.auto)
+            if not wanted or not reader_class.supported():
+                continue
+            try:
+                reader = reader_class(loop, self.protocol, self.host, self.port)
+                reader.start()
+            except OSError as e:
+                print(f"Receive backend {reader_class.name} unavailable ({e}), falling back")
+                continue
+            print(f"Receive backend: {reader_class.name}")
+            return reader
+        return None
     
     @async_timeit
     async def handle_packet(self, data: bytes, addr: Tuple[str, int]):
         """Handle received netflow packet - now calls Rust module directly"""
         try:
             self.packet_count += 1
+            if LOG_EVERY_N and self.packet_count % LOG_EVERY_N == 0:
+                logger.info("Processed %d packets (Rust=%d, Python=%d)",
+                            self.packet_count, self.rust_success_count, self.python_fallback_count)
             
             if self.rust_processing_enabled:
                 # Try Rust processing first
@@ -70,41 +195,53 @@ class NetflowReceiver:
                     return
                 else:
                     # Fallback to Python if Rust fails
-                    print(f"Falling back to Python processing for packet #{self.packet_count}")
+                    logger.debug("Falling back to Python processing for packet #%d", self.packet_count)
             
             # Python fallback processing
             await self.process_with_python(data, addr, self.packet_count)
             self.python_fallback_count += 1
             
         except Exception as e:
-            print(f"Error processing packet from {addr}: {e}")
+            logger.error("Error processing packet from %s: %s", addr, e)
+
+    async def run_cpu_bound(self, func, *args):
+        """Run func in the process pool when there is one, otherwise inline on the event loop"""
+        if self.pool is None:
+            return func(*args)
+        # Views into the receive buffers cannot be pickled, the worker process gets a copy
+        args = [bytes(arg) if isinstance(arg, memoryview) else arg for arg in args]
+        return await asyncio.get_running_loop().run_in_executor(self.pool, func, *args)
 
     async def process_with_rust(self, data: bytes, source_addr: str, source_port: int, packet_number: int) -> bool:
         """Process packet using Rust module"""
         try:
             # Call the Rust function directly - no subprocess needed!
-            output = netflow_processor.process_packet_rust(data, source_addr, source_port, packet_number)
-            print(output, end='')  # Rust already includes newlines
+            if isinstance(data, memoryview):
+                data = bytes(data)  # the Rust module only accepts bytes
+            output = await self.run_cpu_bound(netflow_processor.process_packet_rust, data, source_addr, source_port, packet_number)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(output.rstrip('\n'))  # Rust already includes newlines
             return True
         except Exception as e:
-            print(f"Rust processing failed: {e}")
+            logger.error("Rust processing failed: %s", e)
             return False
 
     async def process_with_python(self, data: bytes, addr: Tuple[str, int], packet_number: int):
         """Python fallback processing"""
         try:
-            packet_info = self.parse_netflow_packet(data)
+            packet_info = await self.run_cpu_bound(NetflowReceiver.parse_netflow_packet, data)
             await self.process_packet_python(packet_info, addr, packet_number)
         except Exception as e:
-            print(f"Python fallback processing failed: {e}")
+            logger.error("Python fallback processing failed: %s", e)
 
-    def parse_netflow_packet(self, data: bytes) -> Dict[str, Any]:
+    @staticmethod
+    def parse_netflow_packet(data: bytes) -> Dict[str, Any]:
         """Parse netflow v5 packet (fallback Python implementation)"""
-        if len(data) < 24:
+        if len(data) < NETFLOW_HEADER.size:
             raise ValueError("Packet too short for netflow header")
             
         # Parse netflow v5 header
-        header = struct.unpack('!HHIIIIBBH', data[:24])
+        header = NETFLOW_HEADER.unpack_from(data, 0)
     
         packet_info = {
             'version': header[0],
@@ -120,30 +257,30 @@ class NetflowReceiver:
             'flows': []
         }
         
-        # Parse individual flow records (48 bytes each for v5)
-        flow_data = data[24:]
-        flow_count = min(header[1], len(flow_data) // 48)
+        # Parse individual flow records (48 bytes each for v5), straight out of the packet without slicing
+        flow_count = min(header[1], (len(data) - NETFLOW_HEADER.size) // NETFLOW_FLOW.size)
+
+        if NUMPY_AVAILABLE:
+            # All flows at once as a record array; turned into dicts only when displayed
+            packet_info['flows'] = np.frombuffer(data, dtype=NETFLOW_FLOW_DTYPE, count=flow_count, offset=NETFLOW_HEADER.size)
+            return packet_info
         
         for i in range(flow_count):
-            offset = i * 48
-            flow_bytes = flow_data[offset:offset + 48]
-            if len(flow_bytes) >= 48:
-                flow = self.parse_flow_record(flow_bytes)
-                packet_info['flows'].append(flow)
+            flow = NetflowReceiver.parse_flow_record(data, NETFLOW_HEADER.size + i * NETFLOW_FLOW.size)
+            packet_info['flows'].append(flow)
                 
         return packet_info
 
-    def parse_flow_record(self, data: bytes) -> Dict[str, Any]:
+    @staticmethod
+    def parse_flow_record(data: bytes, offset: int = 0) -> Dict[str, Any]:
         """Parse a single netflow v5 flow record (fallback Python implementation)"""
         # Netflow v5 flow record format (48 bytes) - must match sender format
-        # flow = struct.unpack('!IIIHHIIIIHHBBBBHHBB', data)
-        # Netflow v5 flow record format (48 bytes) - must match sender format
-        flow = struct.unpack('!IIIHHIIIIHHBBBBHHBBH', data)
+        flow = NETFLOW_FLOW.unpack_from(data, offset)
         
         return {
-            'srcaddr': socket.inet_ntoa(struct.pack('!I', flow[0])),
-            'dstaddr': socket.inet_ntoa(struct.pack('!I', flow[1])),
-            'nexthop': socket.inet_ntoa(struct.pack('!I', flow[2])),
+            'srcaddr': ipv4_to_str(flow[0]),
+            'dstaddr': ipv4_to_str(flow[1]),
+            'nexthop': ipv4_to_str(flow[2]),
             'input_snmp': flow[3],
             'output_snmp': flow[4],
             'packets': flow[5],
@@ -165,45 +302,37 @@ class NetflowReceiver:
 
     async def process_packet_python(self, packet_info: Dict[str, Any], addr: Tuple[str, int], packet_number: int):
         """Process and display received netflow packet (fallback Python implementation)"""
-        print(f"\n{'='*70}")
-        print(f"Netflow Packet #{packet_number} received from {addr[0]}:{addr[1]} (Python fallback)")
-        print(f"Timestamp: {packet_info['timestamp']}")
-        print(f"Version: {packet_info['version']}, Flow count: {packet_info['count']}")
-        print(f"Sequence: {packet_info['flow_sequence']}")
-        print(f"System uptime: {packet_info['sys_uptime']} ms")
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
+        # Build the whole report first, then emit it in a single write
+        lines = [
+            f"\n{'='*70}",
+            f"Netflow Packet #{packet_number} received from {addr[0]}:{addr[1]} (Python fallback)",
+            f"Timestamp: {packet_info['timestamp']}",
+            f"Version: {packet_info['version']}, Flow count: {packet_info['count']}",
+            f"Sequence: {packet_info['flow_sequence']}",
+            f"System uptime: {packet_info['sys_uptime']} ms",
+        ]
         
-        for i, flow in enumerate(packet_info['flows'], 1):
+        for i, flow in enumerate(flow_dicts(packet_info['flows']), 1):
             protocol_name = self.get_protocol_name(flow['protocol'])
-            print(f"\n Flow {i}:")
-            print(f"   Source: {flow['srcaddr']}:{flow['srcport']}")
-            print(f"   Destination: {flow['dstaddr']}:{flow['dstport']}")
-            print(f"   Protocol: {protocol_name} ({flow['protocol']})")
-            print(f"   Packets: {flow['packets']:,}, Bytes: {flow['bytes']:,}")
-            print(f"   TCP Flags: 0x{flow['tcp_flags']:02x}")
-            print(f"   AS Path: {flow['src_as']} → {flow['dst_as']}")
-            print(f"   Next Hop: {flow['nexthop']}")
+            lines += [
+                f"\n Flow {i}:",
+                f"   Source: {flow['srcaddr']}:{flow['srcport']}",
+                f"   Destination: {flow['dstaddr']}:{flow['dstport']}",
+                f"   Protocol: {protocol_name} ({flow['protocol']})",
+                f"   Packets: {flow['packets']:,}, Bytes: {flow['bytes']:,}",
+                f"   TCP Flags: 0x{flow['tcp_flags']:02x}",
+                f"   AS Path: {flow['src_as']} → {flow['dst_as']}",
+                f"   Next Hop: {flow['nexthop']}",
+            ]
         
-        print(f"{'='*70}")
+        lines.append(f"{'='*70}")
+        logger.debug('\n'.join(lines))
     
     def get_protocol_name(self, protocol_num: int) -> str:
-        """Convert protocol number to name"""
-        if RUST_AVAILABLE:
-            try:
-                return netflow_processor.get_protocol_name(protocol_num)
-            except:
-                pass
-        
-        # Python fallback
-        protocols = {
-            1: 'ICMP',
-            6: 'TCP',
-            17: 'UDP',
-            47: 'GRE',
-            50: 'ESP',
-            51: 'AH',
-            89: 'OSPF'
-        }
-        return protocols.get(protocol_num, f'Unknown({protocol_num})')
+        """Convert protocol number to name (a plain table lookup, no call into Rust needed)"""
+        return PROTOCOL_NAMES[protocol_num]
 
     async def process_flows(self):
         """Main processing function that waits for incoming flows"""
@@ -230,10 +359,10 @@ class NetflowReceiver:
                 await asyncio.sleep(10)
                 # Print processing statistics every 10 seconds
                 if self.packet_count > 0:
-                    print(f"Stats: Total={self.packet_count}, Rust={self.rust_success_count}, Python={self.python_fallback_count}")
+                    print(f"Stats: Total={self.packet_count}, Rust={self.rust_success_count}, Python={self.python_fallback_count}, Dropped={self.protocol.dropped_count}")
         except KeyboardInterrupt:
             print("\n Receiver interrupted by user")
-            print(f"Final Stats: Total={self.packet_count}, Rust={self.rust_success_count}, Python={self.python_fallback_count}")
+            print(f"Final Stats: Total={self.packet_count}, Rust={self.rust_success_count}, Python={self.python_fallback_count}, Dropped={self.protocol.dropped_count}")
         finally:
             await self.stop_server()
 
@@ -242,15 +371,418 @@ class NetflowReceiver:
         if self.transport:
             self.transport.close()
             print("🔌 Server stopped")
+        if self.pool:
+            self.pool.shutdown(cancel_futures=True)
 
 class NetflowProtocol(asyncio.DatagramProtocol):
     """UDP protocol handler for netflow packets"""
-    def __init__(self, packet_handler):
+    def __init__(self, packet_handler, worker_count: int = 4, queue_size: int = 10000):
         self.packet_handler = packet_handler
-        
-    def datagram_received(self, data, addr):
-        """Called when a UDP datagram is received"""
-        asyncio.create_task(self.packet_handler(data, addr))
+        self.dropped_count = 0
+        # Set by readers that lend out pooled buffers, called once a packet is done with
+        self.release_buffer = None
+        # Bounded queue drained by a fixed pool of workers, instead of a task per datagram
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.workers = [asyncio.create_task(self._worker()) for _ in range(worker_count)]
+
+    async def _worker(self):
+        """Hand queued datagrams to the packet handler, one at a time"""
+        while True:
+            data, addr, buffer = await self.queue.get()
+            try:
+                await self.packet_handler(data, addr)
+            finally:
+                if buffer is not None:
+                    self.release_buffer(buffer)
+                self.queue.task_done()
+
+    def datagram_received(self, data, addr, buffer=None):
+        """Called when a UDP datagram is received, buffer is the pooled buffer backing data (if any)"""
+        try:
+            self.queue.put_nowait((data, addr, buffer))
+        except asyncio.QueueFull:
+            # Shed load rather than let the backlog grow without bound
+            self.dropped_count += 1
+            if buffer is not None:
+                self.release_buffer(buffer)
+
+    def datagrams_received(self, batch, dropped=0):
+        """Called with a batch of (data, addr) pairs by the threaded readers, plus what they dropped meanwhile"""
+        self.dropped_count += dropped
+        for data, addr in batch:
+            self.datagram_received(data, addr)
+
+    def connection_lost(self, exc):
+        """Called when the transport is closed"""
+        for worker in self.workers:
+            worker.cancel()
+
+class RecvIntoReader:
+    """Receive on the event loop with recvmsg_into, into a pool of preallocated buffers"""
+    name = 'recvmsg_into'
+    auto = True  # tried by RECV_BACKEND=auto
+    BUFFER_COUNT = 1024
+    BUFFER_SIZE = 2048
+    MAX_READS = 64  # per readiness callback, so a flood cannot starve the loop
+
+    def __init__(self, loop, protocol, host: str, port: int):
+        self.loop = loop
+        self.protocol = protocol
+        self.sock = open_udp_socket(host, port)
+        self.sock.setblocking(False)
+        # Packets are handed on as views into these buffers, which come back once processed
+        self.free_buffers = deque(bytearray(self.BUFFER_SIZE) for _ in range(self.BUFFER_COUNT))
+        self.protocol.release_buffer = self.free_buffers.append
+
+    @staticmethod
+    def supported() -> bool:
+        return hasattr(socket.socket, 'recvmsg_into')
+
+    def start(self):
+        self.loop.add_reader(self.sock.fileno(), self._read)
+
+    def _read(self):
+        for _ in range(self.MAX_READS):
+            if not self.free_buffers:
+                # Every buffer is still in flight, drop the datagram rather than block
+                try:
+                    self.sock.recv(self.BUFFER_SIZE)
+                except (BlockingIOError, InterruptedError):
+                    return
+                self.protocol.dropped_count += 1
+                continue
+            buffer = self.free_buffers.popleft()
+            try:
+                nbytes, _, msg_flags, addr = self.sock.recvmsg_into([buffer])
+            except (BlockingIOError, InterruptedError):
+                self.free_buffers.appendleft(buffer)
+                return
+            except OSError as e:
+                self.free_buffers.appendleft(buffer)
+                logger.error("recvmsg_into failed: %s", e)
+                return
+            if msg_flags & socket.MSG_TRUNC:
+                # Larger than a pool buffer, parsing the cut-off remainder would give garbage
+                self.free_buffers.appendleft(buffer)
+                self.protocol.dropped_count += 1
+                continue
+            self.protocol.datagram_received(memoryview(buffer)[:nbytes], addr, buffer)
+
+    def close(self):
+        self.loop.remove_reader(self.sock.fileno())
+        self.sock.close()
+        self.protocol.connection_lost(None)
+
+# ctypes mirrors of the Linux structures used by recvmmsg(2)
+class _Iovec(ctypes.Structure):
+    _fields_ = [('iov_base', ctypes.c_void_p), ('iov_len', ctypes.c_size_t)]
+
+class _SockaddrIn(ctypes.Structure):
+    _fields_ = [('sin_family', ctypes.c_ushort), ('sin_port', ctypes.c_uint16),
+                ('sin_addr', ctypes.c_uint8 * 4), ('sin_zero', ctypes.c_uint8 * 8)]
+
+class _Msghdr(ctypes.Structure):
+    _fields_ = [('msg_name', ctypes.c_void_p), ('msg_namelen', ctypes.c_uint32),
+                ('msg_iov', ctypes.POINTER(_Iovec)), ('msg_iovlen', ctypes.c_size_t),
+                ('msg_control', ctypes.c_void_p), ('msg_controllen', ctypes.c_size_t),
+                ('msg_flags', ctypes.c_int)]
+
+class _Mmsghdr(ctypes.Structure):
+    _fields_ = [('msg_hdr', _Msghdr), ('msg_len', ctypes.c_uint)]
+
+class ThreadedReader(abc.ABC):
+    """Receive datagrams on a background thread and hand them to the protocol in batches"""
+    name = 'threaded'
+    auto = True  # tried by RECV_BACKEND=auto
+
+    def __init__(self, loop, protocol, host: str, port: int):
+        self.loop = loop
+        self.protocol = protocol
+        self.sock = open_udp_socket(host, port)
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._run, name=f'{self.name}-reader', daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    @abc.abstractmethod
+    def _run(self):
+        """Receive loop, runs on the reader thread until stopped is set"""
+
+    def deliver(self, batch, dropped=0):
+        """One hop onto the event loop per batch, not per packet; drops are counted there too, not on this thread"""
+        self.loop.call_soon_threadsafe(self.protocol.datagrams_received, batch, dropped)
+
+    def close(self):
+        self.stopped.set()
+        self.thread.join()
+        self.sock.close()
+        self.protocol.connection_lost(None)
+
+class RecvmmsgReader(ThreadedReader):
+    """Receive datagrams in batches with recvmmsg(2) (Linux only)"""
+    name = 'recvmmsg'
+    BATCH_SIZE = 64
+    BUFFER_SIZE = 2048
+    MSG_WAITFORONE = 0x10000
+
+    def __init__(self, loop, protocol, host: str, port: int):
+        super().__init__(loop, protocol, host, port)
+        # Wake up periodically so the thread notices close()
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVTIMEO, struct.pack('ll', 1, 0))
+
+        # Buffers and headers are allocated once and reused for every syscall
+        self.libc = ctypes.CDLL(None, use_errno=True)
+        self.buffers = [ctypes.create_string_buffer(self.BUFFER_SIZE) for _ in range(self.BATCH_SIZE)]
+        self.iovecs = (_Iovec * self.BATCH_SIZE)()
+        self.addrs = (_SockaddrIn * self.BATCH_SIZE)()
+        self.msgs = (_Mmsghdr * self.BATCH_SIZE)()
+        for i in range(self.BATCH_SIZE):
+            self.iovecs[i].iov_base = ctypes.addressof(self.buffers[i])
+            self.iovecs[i].iov_len = self.BUFFER_SIZE
+            hdr = self.msgs[i].msg_hdr
+            hdr.msg_name = ctypes.addressof(self.addrs[i])
+            hdr.msg_iov = ctypes.pointer(self.iovecs[i])
+            hdr.msg_iovlen = 1
+
+    @staticmethod
+    def supported() -> bool:
+        """recvmmsg is a Linux syscall, reachable through libc"""
+        if not sys.platform.startswith('linux'):
+            return False
+        try:
+            return hasattr(ctypes.CDLL(None), 'recvmmsg')
+        except OSError:
+            return False
+
+    def _run(self):
+        fd = self.sock.fileno()
+        namelen = ctypes.sizeof(_SockaddrIn)
+        while not self.stopped.is_set():
+            for i in range(self.BATCH_SIZE):
+                self.msgs[i].msg_hdr.msg_namelen = namelen
+            count = self.libc.recvmmsg(fd, self.msgs, self.BATCH_SIZE, self.MSG_WAITFORONE, None)
+            if count < 0:
+                err = ctypes.get_errno()
+                if err in (errno.EAGAIN, errno.EWOULDBLOCK, errno.EINTR):
+                    continue
+                if not self.stopped.is_set():
+                    logger.error("recvmmsg failed: %s", os.strerror(err))
+                return
+            batch = []
+            dropped = 0
+            for i in range(count):
+                if self.msgs[i].msg_hdr.msg_flags & socket.MSG_TRUNC:
+                    # Larger than the buffer, parsing the cut-off remainder would give garbage
+                    dropped += 1
+                    continue
+                addr = self.addrs[i]
+                data = ctypes.string_at(self.buffers[i], self.msgs[i].msg_len)
+                batch.append((data, (socket.inet_ntoa(bytes(addr.sin_addr)), socket.ntohs(addr.sin_port))))
+            self.deliver(batch, dropped)
+
+# ctypes mirrors of the io_uring structures used below
+class _IoUringCqe(ctypes.Structure):
+    _fields_ = [('user_data', ctypes.c_uint64), ('res', ctypes.c_int32), ('flags', ctypes.c_uint32)]
+
+class _KernelTimespec(ctypes.Structure):
+    _fields_ = [('tv_sec', ctypes.c_int64), ('tv_nsec', ctypes.c_longlong)]
+
+def _load_liburing():
+    """Load liburing-ffi (liburing >= 2.4), which also exports the inline helpers, or return None"""
+    path = ctypes.util.find_library('uring-ffi')
+    if path is None:
+        return None
+    try:
+        lib = ctypes.CDLL(path, use_errno=True)
+    except OSError:
+        return None
+    p, u, i = ctypes.c_void_p, ctypes.c_uint, ctypes.c_int
+    cqe_pp = ctypes.POINTER(ctypes.POINTER(_IoUringCqe))
+    signatures = {
+        'io_uring_queue_init_params': (i, [u, p, p]),
+        'io_uring_queue_exit': (None, [p]),
+        'io_uring_setup_buf_ring': (p, [p, u, i, u, ctypes.POINTER(i)]),
+        'io_uring_free_buf_ring': (i, [p, p, u, i]),
+        'io_uring_buf_ring_add': (None, [p, p, u, ctypes.c_ushort, i, i]),
+        'io_uring_buf_ring_advance': (None, [p, i]),
+        'io_uring_buf_ring_mask': (i, [ctypes.c_uint32]),
+        'io_uring_get_sqe': (p, [p]),
+        'io_uring_prep_recvmsg_multishot': (None, [p, i, p, u]),
+        'io_uring_sqe_set_flags': (None, [p, u]),
+        'io_uring_submit': (i, [p]),
+        'io_uring_wait_cqe_timeout': (i, [p, cqe_pp, ctypes.POINTER(_KernelTimespec)]),
+        'io_uring_peek_cqe': (i, [p, cqe_pp]),
+        'io_uring_cqe_seen': (None, [p, ctypes.POINTER(_IoUringCqe)]),
+    }
+    try:
+        for func_name, (restype, argtypes) in signatures.items():
+            func = getattr(lib, func_name)
+            func.restype = restype
+            func.argtypes = argtypes
+    except AttributeError:
+        return None
+    return lib
+
+class IoUringReader(ThreadedReader):
+    """Receive datagrams with a multishot io_uring recvmsg into a provided buffer ring (Linux only)"""
+    name = 'io_uring'
+    # Opt-in only (RECV_BACKEND=io_uring): the receiver image does not ship liburing-ffi
+    auto = False
+    RING_ENTRIES = 64
+    BUFFER_COUNT = 256  # must be a power of two
+    BUFFER_SIZE = 2048
+    BUFFER_GROUP = 0
+    RECVMSG_OUT_SIZE = 16  # struct io_uring_recvmsg_out
+    RECVMSG_OUT_FLAGS_OFFSET = 12  # offset of flags in struct io_uring_recvmsg_out
+    SQE_BUF_GROUP_OFFSET = 40  # offset of buf_group in struct io_uring_sqe
+    IORING_SETUP_COOP_TASKRUN = 1 << 8
+    IORING_SETUP_SINGLE_ISSUER = 1 << 12
+    IORING_SETUP_DEFER_TASKRUN = 1 << 13
+    IOSQE_BUFFER_SELECT = 1 << 5
+    IORING_CQE_F_BUFFER = 1 << 0
+    IORING_CQE_F_MORE = 1 << 1
+    IORING_CQE_BUFFER_SHIFT = 16
+
+    _liburing = None
+
+    @classmethod
+    def supported(cls) -> bool:
+        if not sys.platform.startswith('linux'):
+            return False
+        if cls._liburing is None:
+            cls._liburing = _load_liburing() or False
+        return bool(cls._liburing)
+
+    def __init__(self, loop, protocol, host: str, port: int):
+        super().__init__(loop, protocol, host, port)
+        self.lib = self._liburing
+        self.ready = threading.Event()
+        self.error = None
+        # Opaque storage for struct io_uring and struct io_uring_params, generously sized
+        self.ring = ctypes.create_string_buffer(512)
+        self.params = (ctypes.c_uint32 * 30)()
+        # One contiguous pool backing the provided buffer ring, handed to the kernel once
+        self.pool = ctypes.create_string_buffer(self.BUFFER_COUNT * self.BUFFER_SIZE)
+        self.pool_addr = ctypes.addressof(self.pool)
+        self.buf_ring = None
+        self.mask = 0
+        self.armed = False
+        # Template for every multishot completion: room for the source address, no control data
+        self.name_len = ctypes.sizeof(_SockaddrIn)
+        self.msgh = _Msghdr()
+        self.msgh.msg_namelen = self.name_len
+
+    def start(self):
+        """The ring is owned by the reader thread (SINGLE_ISSUER), so setup happens there"""
+        super().start()
+        self.ready.wait()
+        if self.error is not None:
+            self.thread.join()
+            self.sock.close()
+            raise self.error
+
+    def _setup(self):
+        lib = self.lib
+        flags = self.IORING_SETUP_COOP_TASKRUN | self.IORING_SETUP_SINGLE_ISSUER | self.IORING_SETUP_DEFER_TASKRUN
+        self.params[2] = flags
+        ret = lib.io_uring_queue_init_params(self.RING_ENTRIES, self.ring, self.params)
+        if ret < 0:
+            # Older kernels reject the task-run flags, a plain ring still works
+            ctypes.memset(self.params, 0, ctypes.sizeof(self.params))
+            ret = lib.io_uring_queue_init_params(self.RING_ENTRIES, self.ring, self.params)
+        if ret < 0:
+            raise OSError(-ret, f"io_uring_queue_init_params: {os.strerror(-ret)}")
+
+        ret = ctypes.c_int(0)
+        self.buf_ring = lib.io_uring_setup_buf_ring(self.ring, self.BUFFER_COUNT, self.BUFFER_GROUP, 0, ctypes.byref(ret))
+        if not self.buf_ring:
+            lib.io_uring_queue_exit(self.ring)
+            raise OSError(-ret.value, f"io_uring_setup_buf_ring: {os.strerror(-ret.value)}")
+        self.mask = lib.io_uring_buf_ring_mask(self.BUFFER_COUNT)
+        for bid in range(self.BUFFER_COUNT):
+            lib.io_uring_buf_ring_add(self.buf_ring, self.pool_addr + bid * self.BUFFER_SIZE,
+                                      self.BUFFER_SIZE, bid, self.mask, bid)
+        lib.io_uring_buf_ring_advance(self.buf_ring, self.BUFFER_COUNT)
+        self.armed = self._arm()
+        if not self.armed:
+            lib.io_uring_free_buf_ring(self.ring, self.buf_ring, self.BUFFER_COUNT, self.BUFFER_GROUP)
+            lib.io_uring_queue_exit(self.ring)
+            raise OSError(errno.EBUSY, "io_uring_get_sqe: no free submission queue entry")
+
+    def _arm(self) -> bool:
+        """Submit the multishot recvmsg, it keeps completing until the kernel drops it"""
+        sqe = self.lib.io_uring_get_sqe(self.ring)
+        if not sqe:
+            # Submission queue full: flush it and try once more, otherwise the caller retries later
+            self.lib.io_uring_submit(self.ring)
+            sqe = self.lib.io_uring_get_sqe(self.ring)
+            if not sqe:
+                return False
+        self.lib.io_uring_prep_recvmsg_multishot(sqe, self.sock.fileno(), ctypes.addressof(self.msgh), 0)
+        self.lib.io_uring_sqe_set_flags(sqe, self.IOSQE_BUFFER_SELECT)
+        ctypes.c_uint16.from_address(sqe + self.SQE_BUF_GROUP_OFFSET).value = self.BUFFER_GROUP
+        self.lib.io_uring_submit(self.ring)
+        return True
+
+    def _complete(self, cqe, batch) -> int:
+        """Turn one completion into a datagram and give its buffer back to the ring, returns the number dropped"""
+        res, flags = cqe.res, cqe.flags
+        dropped = 0
+        if flags & self.IORING_CQE_F_BUFFER:
+            bid = flags >> self.IORING_CQE_BUFFER_SHIFT
+            buf = self.pool_addr + bid * self.BUFFER_SIZE
+            if res >= 0 and ctypes.c_uint32.from_address(buf + self.RECVMSG_OUT_FLAGS_OFFSET).value & socket.MSG_TRUNC:
+                # Larger than the buffer, parsing the cut-off remainder would give garbage
+                dropped = 1
+            elif res >= 0:
+                # Layout: io_uring_recvmsg_out, then msg_namelen bytes of address, then the payload
+                payload = self.RECVMSG_OUT_SIZE + self.name_len
+                addr = _SockaddrIn.from_address(buf + self.RECVMSG_OUT_SIZE)
+                data = ctypes.string_at(buf + payload, res - payload)
+                batch.append((data, (socket.inet_ntoa(bytes(addr.sin_addr)), socket.ntohs(addr.sin_port))))
+            self.lib.io_uring_buf_ring_add(self.buf_ring, buf, self.BUFFER_SIZE, bid, self.mask, 0)
+            self.lib.io_uring_buf_ring_advance(self.buf_ring, 1)
+        elif res < 0 and res != -errno.ENOBUFS:
+            logger.error("io_uring recvmsg failed: %s", os.strerror(-res))
+        if not flags & self.IORING_CQE_F_MORE and not self.stopped.is_set():
+            self.armed = self._arm()
+        return dropped
+
+    def _run(self):
+        try:
+            self._setup()
+        except OSError as e:
+            self.error = e
+            return
+        finally:
+            self.ready.set()
+
+        lib = self.lib
+        cqe_p = ctypes.POINTER(_IoUringCqe)()
+        timeout = _KernelTimespec(1, 0)  # wake up periodically so the thread notices close()
+        try:
+            while not self.stopped.is_set():
+                if not self.armed:
+                    self.armed = self._arm()
+                ret = lib.io_uring_wait_cqe_timeout(self.ring, ctypes.byref(cqe_p), ctypes.byref(timeout))
+                if ret in (-errno.ETIME, -errno.EINTR):
+                    continue
+                if ret < 0:
+                    logger.error("io_uring wait failed: %s", os.strerror(-ret))
+                    return
+                # Drain every completion that is ready before crossing over to the event loop
+                batch = []
+                dropped = 0
+                while ret == 0:
+                    dropped += self._complete(cqe_p.contents, batch)
+                    lib.io_uring_cqe_seen(self.ring, cqe_p)
+                    ret = lib.io_uring_peek_cqe(self.ring, ctypes.byref(cqe_p))
+                if batch or dropped:
+                    self.deliver(batch, dropped)
+        finally:
+            lib.io_uring_free_buf_ring(self.ring, self.buf_ring, self.BUFFER_COUNT, self.BUFFER_GROUP)
+            lib.io_uring_queue_exit(self.ring)
 
 # Advanced Rust integration functions
 def demonstrate_rust_features():
@@ -286,17 +818,23 @@ def demonstrate_rust_features():
 
 async def main():
     """Main function that starts the event loop and waits on process_flows"""
+    logging.basicConfig(level=os.getenv('LOG_LEVEL', 'INFO').upper(), format='%(message)s', stream=sys.stdout)
     print("=== Netflow Receiver Container with PyO3 Rust Processing ===")
 
     # Get configuration from environment or use defaults
     listen_host = os.getenv('LISTEN_HOST', '0.0.0.0')
     listen_port = int(os.getenv('LISTEN_PORT', '2055'))
+    worker_count = int(os.getenv('WORKER_COUNT', '4'))
+    queue_size = int(os.getenv('QUEUE_SIZE', '10000'))
+    recv_backend = os.getenv('RECV_BACKEND', 'auto').lower()
+    # Off by default: shipping one small packet to a worker costs the event loop more than parsing it inline
+    process_workers = int(os.getenv('PROCESS_WORKERS', '0'))
 
     # Demonstrate Rust features if available
     if os.getenv('DEMO_RUST', 'false').lower() == 'true':
         demonstrate_rust_features()
 
-    receiver = NetflowReceiver(listen_host, listen_port)
+    receiver = NetflowReceiver(listen_host, listen_port, worker_count, queue_size, recv_backend, process_workers)
 
     try:
         # Main event loop waits on process_flows
@@ -304,6 +842,26 @@ async def main():
     except Exception as e:
         print(f"Receiver error: {e}")
 
+def run_receiver_process():
+    """Entry point of one receiver process, each runs its own event loop on the shared port"""
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
+
 if __name__ == "__main__":
-    # Start the asyncio event loop
-    asyncio.run(main())
+    if RECEIVER_PROCESSES > 1:
+        # One receiver per process, all bound to the same port with SO_REUSEPORT
+        processes = [multiprocessing.Process(target=run_receiver_process, name=f'receiver-{i}')
+                     for i in range(RECEIVER_PROCESSES)]
+        for process in processes:
+            process.start()
+        try:
+            for process in processes:
+                process.join()
+        except KeyboardInterrupt:
+            for process in processes:
+                process.terminate()
+    else:
+        # Start the asyncio event loop
+        asyncio.run(main())
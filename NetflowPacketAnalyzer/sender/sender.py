@@ -5,6 +5,11 @@ from datetime import datetime
 import random
 import os
 
+# Netflow v5 wire formats, compiled once instead of on every pack
+NETFLOW_HEADER = struct.Struct('!HHIIIIBBH')  # 24 bytes
+NETFLOW_FLOW = struct.Struct('!IIIHHIIIIHHBBBBHHBBH')  # 48 bytes
+NEXTHOP_ADDR = int.from_bytes(socket.inet_aton('192.168.1.1'), 'big')
+
 class NetflowSender:
     def __init__(self, target_host: str = 'receiver', target_port: int = 2055):
         self.target_host = target_host
@@ -16,6 +21,8 @@ class NetflowSender:
         # Generate random flow data for more realistic testing
         src_ip = f"192.168.1.{random.randint(1, 254)}"
         dst_ip = f"10.0.0.{random.randint(1, 254)}"
+        src_addr = int.from_bytes(socket.inet_aton(src_ip), 'big')
+        dst_addr = int.from_bytes(socket.inet_aton(dst_ip), 'big')
         src_port = random.randint(1024, 65535)
         dst_port = random.choice([80, 443, 22, 25, 53, 8080])
         protocol = random.choice([6, 17, 1])  # TCP, UDP, ICMP
@@ -23,7 +30,7 @@ class NetflowSender:
         bytes_count = packets * random.randint(64, 1500)
         
         # Create netflow v5 header
-        header = struct.pack('!HHIIIIBBH', 
+        header = NETFLOW_HEADER.pack(
             5,          # version
             1,          # count (1 flow record)
             random.randint(10000, 99999),  # sys_uptime
@@ -36,29 +43,28 @@ class NetflowSender:
         )
         
         # Create flow record (netflow v5 format - 48 bytes total)
-        # Build it step by step to avoid struct format issues
-        flow = b''
-        flow += struct.pack('!I', struct.unpack('!I', socket.inet_aton(src_ip))[0])     # srcaddr (4)
-        flow += struct.pack('!I', struct.unpack('!I', socket.inet_aton(dst_ip))[0])     # dstaddr (4)  
-        flow += struct.pack('!I', struct.unpack('!I', socket.inet_aton('192.168.1.1'))[0]) # nexthop (4)
-        flow += struct.pack('!H', 1)           # input_snmp (2)
-        flow += struct.pack('!H', 2)           # output_snmp (2)
-        flow += struct.pack('!I', packets)     # packets (4)
-        flow += struct.pack('!I', bytes_count) # bytes (4)
-        flow += struct.pack('!I', 1000)        # first (4)
-        flow += struct.pack('!I', 2000)        # last (4)
-        flow += struct.pack('!H', src_port)    # srcport (2)
-        flow += struct.pack('!H', dst_port)    # dstport (2)
-        flow += struct.pack('!B', 0)           # pad1 (1)
-        flow += struct.pack('!B', 0x18)        # tcp_flags (1)
-        flow += struct.pack('!B', protocol)    # protocol (1)
-        flow += struct.pack('!B', 0)           # tos (1)
-        flow += struct.pack('!H', 65001)       # src_as (2)
-        flow += struct.pack('!H', 65002)       # dst_as (2)
-        flow += struct.pack('!B', 24)          # src_mask (1)
-        flow += struct.pack('!B', 24)          # dst_mask (1)
-        flow += struct.pack('!H', 0)           # pad2 (2)
-        # Total: 48 bytes
+        flow = NETFLOW_FLOW.pack(
+            src_addr,       # srcaddr
+            dst_addr,       # dstaddr
+            NEXTHOP_ADDR,   # nexthop
+            1,              # input_snmp
+            2,              # output_snmp
+            packets,        # packets
+            bytes_count,    # bytes
+            1000,           # first
+            2000,           # last
+            src_port,       # srcport
+            dst_port,       # dstport
+            0,              # pad1
+            0x18,           # tcp_flags
+            protocol,       # protocol
+            0,              # tos
+            65001,          # src_as
+            65002,          # dst_as
+            24,             # src_mask
+            24,             # dst_mask
+            0               # pad2
+        )
         
         self.sequence += 1
         return header + flow